@@ -1,10 +1,13 @@
+from dataclasses import dataclass
+
 import streamlit as st
 import pandas as pd
 import pulp
 import matplotlib.pyplot as plt
 import numpy as np
-import math
 from matplotlib.patches import Patch
+from numba import njit
+from scipy.optimize import Bounds, LinearConstraint, milp
 
 
 ## Page config: wide layout
@@ -34,6 +37,195 @@ default_scores = {
     "Encrusting": 0.45
 }
 
+## Per growth form user inputs, collected once and read by everything downstream
+@dataclass
+class GFInputs:
+    enabled: bool
+    supply: int = 0
+    prop: float = 0.0
+    eco: float = 1.0
+    cluster: float = 0.5
+
+
+## Solver backend: HiGHS (scipy.optimize.milp) solves in-process; set True to use PuLP/CBC instead
+USE_PULP_SOLVER = False
+
+
+## Linear optimisation with HiGHS
+## Variable vector is [alloc_0..alloc_n-1, T, slack_0..slack_n-1], mirroring the PuLP model below.
+def solve_with_milp(supply, user_props, eco_scores, tol):
+    n = len(supply)
+    eye = np.eye(n)
+
+    ## Objective: maximise weighted ecological function (milp minimises, so negate)
+    c = np.concatenate([-np.asarray(eco_scores, dtype=float), np.zeros(n + 1)])
+
+    ## Total allocated definition: sum(alloc) - T == 0
+    total_def = LinearConstraint(np.concatenate([np.ones(n), [-1.0], np.zeros(n)]), 0, 0)
+
+    ## Proportion constraints: alloc + slack - prop * T >= 0
+    prop_lower = LinearConstraint(
+        np.hstack([eye, -np.asarray(user_props, dtype=float)[:, None], eye]), 0, np.inf
+    )
+
+    ## Supply and slack caps as variable bounds
+    bounds = Bounds(
+        np.concatenate([np.zeros(n), [1.0], np.zeros(n)]),
+        np.concatenate([np.asarray(supply, dtype=float), [np.inf], np.full(n, float(tol))])
+    )
+
+    res = milp(c, constraints=[total_def, prop_lower], integrality=np.ones(2 * n + 1), bounds=bounds)
+    if not res.success:
+        return None
+    return [int(v) for v in np.round(res.x[:n])]
+
+
+## CBC command is built once per process and shared by every PuLP solve
+@st.cache_resource(show_spinner=False)
+def get_pulp_solver():
+    return pulp.PULP_CBC_CMD(msg=0)
+
+
+## Linear optimisation with PuLP
+def solve_with_pulp(enabled_groups, supply, user_props, eco_scores, tol):
+    enabled_groups = list(enabled_groups)  # PuLP treats tuple indices as multi-dimensional
+    supply = dict(zip(enabled_groups, supply))
+    user_props = dict(zip(enabled_groups, user_props))
+    eco_scores = dict(zip(enabled_groups, eco_scores))
+
+    alloc = pulp.LpVariable.dicts("alloc", enabled_groups, lowBound=0, cat="Integer")
+    T = pulp.LpVariable("TotalAllocated", lowBound=1, cat="Integer")
+    slack = pulp.LpVariable.dicts("slack", enabled_groups, lowBound=0, cat="Integer")
+
+    prob = pulp.LpProblem("CoralAllocation", pulp.LpMaximize)
+
+    ## Objective: maximise weighted ecological function
+    prob += pulp.lpSum([eco_scores[f] * alloc[f] for f in enabled_groups]), "MaximiseWeightedFunction"
+
+    ## Total allocated definition
+    prob += pulp.lpSum([alloc[f] for f in enabled_groups]) == T, "TotalDef"
+
+    ## Constraints
+    for gf in enabled_groups:
+        prob += alloc[gf] <= supply[gf], f"Supply_{gf}"
+        prob += alloc[gf] + slack[gf] >= user_props[gf] * T, f"PropLower_{gf}"
+        prob += slack[gf] <= tol, f"SlackCap_{gf}"
+
+    status = prob.solve(get_pulp_solver())
+    if pulp.LpStatus[status] != "Optimal":
+        return None
+    return [int(pulp.value(alloc[gf])) for gf in enabled_groups]
+
+
+## Inputs are tuples aligned with enabled_groups so the result can be cached across reruns.
+## Returns the optimal allocation per enabled group, or None if no feasible solution exists.
+@st.cache_data(show_spinner=False)
+def solve_allocation(enabled_groups, supply, user_props, eco_scores, tol):
+    ## Single growth form: the whole supply is optimal whenever its target proportion is at most 1
+    if len(enabled_groups) == 1 and supply[0] >= 1 and user_props[0] <= 1:
+        return [supply[0]]
+
+    if USE_PULP_SOLVER:
+        return solve_with_pulp(enabled_groups, supply, user_props, eco_scores, tol)
+    return solve_with_milp(supply, user_props, eco_scores, tol)
+
+
+## Reef layout grid cell value for "no reef star" (growth form ids are 0..N-1)
+EMPTY_CELL = 255
+
+
+## Reef layout placement (compiled with Numba; cached on disk so shuffles skip recompilation)
+## star_ids are uint8 indices into enabled_groups and rng is a np.random.Generator;
+## returns the uint8 grid of placed ids, EMPTY_CELL where nothing was placed.
+## Each star tries up to max_tries cells: next to a placed star of its own form with probability
+## equal to its clustering score, otherwise a random cell.
+@njit(cache=True)
+def place_reef_stars(star_ids, cluster_scores, height, width, rng, max_tries=200):
+    grid = np.full((height, width), EMPTY_CELL, dtype=np.uint8)
+    positions_y = np.empty((len(cluster_scores), len(star_ids)), dtype=np.int64)
+    positions_x = np.empty((len(cluster_scores), len(star_ids)), dtype=np.int64)
+    n_placed = np.zeros(len(cluster_scores), dtype=np.int64)
+
+    for star in star_ids:
+        for _ in range(max_tries):
+            if rng.random() < cluster_scores[star] and n_placed[star] > 0:
+                k = rng.integers(0, n_placed[star])
+                y = min(max(positions_y[star, k] + rng.integers(-1, 2), 0), height - 1)
+                x = min(max(positions_x[star, k] + rng.integers(-1, 2), 0), width - 1)
+            else:
+                y = rng.integers(0, height)
+                x = rng.integers(0, width)
+            if grid[y, x] == EMPTY_CELL:
+                grid[y, x] = star
+                positions_y[star, n_placed[star]] = y
+                positions_x[star, n_placed[star]] = x
+                n_placed[star] += 1
+                break
+    return grid
+
+
+## Figures are cached on their plotted data, so reruns that do not change it skip the redraw.
+## Each builder closes its figure so pyplot does not keep a reference; the cache (bounded by
+## max_entries) owns it, and st.pyplot can still render a closed figure.
+FIGURE_CACHE_ENTRIES = 16
+
+## Growth form colours (tab10 RGB) as one contiguous float32 array
+GROWTH_FORM_RGB = np.ascontiguousarray(np.asarray(plt.cm.tab10.colors, dtype=np.float32)[:, :3])
+
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_alloc_bar_figure(available, allocations, labels):
+    fig, ax = plt.subplots(figsize=(7, 4))
+    pd.DataFrame(
+        {"Available": available, "Optimal Allocation": allocations}, index=labels
+    ).plot(kind="bar", ax=ax, rot=0)
+    ax.set_xticklabels(labels, fontsize=9)
+    ax.set_title("Fragments: Available vs Planned Allocation", fontsize=12)
+    ax.set_ylabel("Number of Fragments", fontsize=10)
+    ax.set_xlabel("Growth form", fontsize=10)
+    ax.tick_params(axis="y", labelsize=9)
+    ax.legend(fontsize=9)
+    fig.tight_layout()
+    plt.close(fig)
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_alloc_pie_figure(allocations, labels):
+    fig, ax = plt.subplots(figsize=(7, 5))
+    pd.Series(allocations, index=labels).plot.pie(
+        labels=labels,
+        autopct="%1.1f%%",
+        ax=ax,
+        textprops={"fontsize": 9}  # controls pie label font size
+    )
+    ax.set_ylabel("")
+    ax.set_title("Proportion of Allocated Fragments", fontsize=12)
+    ax.legend(fontsize=9, bbox_to_anchor=(1.05, 1), loc="upper left")
+    plt.close(fig)
+    return fig
+
+
+## The layout grid is passed as raw bytes + shape so the cache key covers every cell
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)
+def make_reef_layout_figure(grid_bytes, grid_shape, labels, fragments_per_star):
+    grid = np.frombuffer(grid_bytes, dtype=np.uint8).reshape(grid_shape)
+
+    ## One gather through the palette; empty cells map to the extra last row (black)
+    palette = np.vstack([GROWTH_FORM_RGB[:len(labels)], np.zeros((1, 3), dtype=np.float32)])
+    color_grid = palette[np.where(grid != EMPTY_CELL, grid, len(labels))]
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.imshow(color_grid, origin="lower")
+    ax.set_xticks([])
+    ax.set_yticks([])
+    legend_handles = [Patch(color=palette[i], label=gf) for i, gf in enumerate(labels)]
+    ax.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc="upper left")
+    ax.set_title(f"Simulated Reef Layout with Clustering (Dynamic Grid)\nEach square ≈ {fragments_per_star} fragments / 1 reef star")
+    plt.close(fig)
+    return fig
+
+
 st.title("🪸 Coral Restoration Optimisation Tool")
 st.write("**Supply-driven mode**: Allocate available coral fragments across growth forms to optimise for ecological function")
 
@@ -64,40 +256,37 @@ with st.expander("Global Options", expanded=False):
     )
 
 if "layout_seed" not in st.session_state:
-    st.session_state.layout_seed = np.random.randint(0, 1_000_000)
+    st.session_state.layout_seed = np.random.default_rng().integers(0, 1_000_000)
 
 
 ## Available Fragments Input + Tickboxes
 st.subheader("Available Fragments per Growth Form")
 st.caption("Tick to include growth forms and enter the number of fragments available for each.")
 
-supply = {}
-enabled_groups = []
-excluded_groups = []
+inputs = {}
 
 cols = st.columns(len(default_props))
 for i, gf in enumerate(default_props.keys()):
     with cols[i]:
         include = st.checkbox(gf, value=True, key=f"include_{gf}")
+        inputs[gf] = GFInputs(enabled=include)
         if include:
-            enabled_groups.append(gf)
             input_val = st.text_input("Fragments", value="0", key=f"supply_{gf}")
             try:
-                supply[gf] = int(input_val)
+                inputs[gf].supply = int(input_val)
             except ValueError:
                 st.warning(f"Invalid input for {gf}. Using 0.")
-                supply[gf] = 0
         else:
-            excluded_groups.append(gf)
             st.text("")  # keep layout aligned (empty col)
-            supply[gf] = 0
+
+enabled_groups = [gf for gf, inp in inputs.items() if inp.enabled]
 
 # 👉 Guard checks after inputs
-if sum(supply.values()) == 0:
+if sum(inp.supply for inp in inputs.values()) == 0:
     st.info("ℹ️ Please enter the number of coral fragments available above to begin optimisation.")
     st.stop()
 
-if any(supply[gf] == 0 for gf in enabled_groups):
+if any(inputs[gf].supply == 0 for gf in enabled_groups):
     st.error("❌ At least one enabled growth form has 0 available fragments. Please adjust its value or untick it.")
     st.stop()
 
@@ -107,29 +296,9 @@ st.caption(
     "Default proportions are derived from Madin et al. (2023), by filtering their recommended species for the Indian Ocean "
     "and then grouping the set into growth forms and calculating relative representation. Please see documentation for limitations."
 )
-
-user_props = {}
-cols = st.columns(len(default_props))
-for i, gf in enumerate(default_props.keys()):
-    with cols[i]:
-        if gf in enabled_groups:
-            input_val = st.text_input("Target proportion", value=str(default_props[gf]), key=f"text_{gf}")
-            try:
-                user_props[gf] = float(input_val)
-            except ValueError:
-                st.warning(f"Invalid input for {gf}. Using default value.")
-                user_props[gf] = float(default_props[gf])
-        else:
-            st.text("")  # keep alignment
-
-if normalize_toggle:
-    total_prop = sum(user_props.values())
-    if total_prop > 0:
-        user_props = {gf: val / total_prop for gf, val in user_props.items()}
-
+cols_props = st.columns(len(default_props))
 
 ##Ecological function scores (if enabled)
-eco_scores = {}
 if use_weights:
     st.subheader("Ecological Function Scores")
     st.caption(
@@ -137,72 +306,69 @@ if use_weights:
         "Users should adapt scores to their specific ecological context and management goals."
     )
     cols_scores = st.columns(len(default_props))
-    for i, gf in enumerate(default_props.keys()):
-        if gf in enabled_groups:
-            with cols_scores[i]:
-                eco_scores[gf] = st.number_input(
-                    gf,
-                    min_value=0.0, value=default_scores.get(gf, 1.0), step=0.01, key=f"eco_{gf}"
-                )
-        else:
-            st.text("")  # keep alignment
-else:
-    eco_scores = {gf: 1.0 for gf in default_props.keys()}
-
 
-## Linear optimisation with PuLP
-alloc = pulp.LpVariable.dicts("alloc", enabled_groups, lowBound=0, cat="Integer")
-T = pulp.LpVariable("TotalAllocated", lowBound=1, cat="Integer")
-slack = pulp.LpVariable.dicts("slack", enabled_groups, lowBound=0, cat="Integer")
-
-prob = pulp.LpProblem("CoralAllocation", pulp.LpMaximize)
-
-## Objective: maximise weighted ecological function
-prob += pulp.lpSum([eco_scores[f] * alloc[f] for f in enabled_groups]), "MaximiseWeightedFunction"
+## Both sections are laid out above, then filled in a single pass over the growth forms
+for i, gf in enumerate(default_props.keys()):
+    if not inputs[gf].enabled:
+        with cols_props[i]:
+            st.text("")  # keep alignment
+        continue
+
+    with cols_props[i]:
+        input_val = st.text_input("Target proportion", value=str(default_props[gf]), key=f"text_{gf}")
+        try:
+            inputs[gf].prop = float(input_val)
+        except ValueError:
+            st.warning(f"Invalid input for {gf}. Using default value.")
+            inputs[gf].prop = float(default_props[gf])
+
+    if use_weights:
+        with cols_scores[i]:
+            inputs[gf].eco = st.number_input(
+                gf,
+                min_value=0.0, value=default_scores.get(gf, 1.0), step=0.01, key=f"eco_{gf}"
+            )
 
-## Total allocated definition
-prob += pulp.lpSum([alloc[f] for f in enabled_groups]) == T, "TotalDef"
+if normalize_toggle:
+    total_prop = sum(inputs[gf].prop for gf in enabled_groups)
+    if total_prop > 0:
+        for gf in enabled_groups:
+            inputs[gf].prop /= total_prop
 
-## Constraints
-for gf in enabled_groups:
-    prob += alloc[gf] <= supply.get(gf, 0), f"Supply_{gf}"
-    prob += alloc[gf] + slack[gf] >= user_props[gf] * T, f"PropLower_{gf}"
-    prob += slack[gf] <= prop_tolerance, f"SlackCap_{gf}"
 
-status = prob.solve(pulp.PULP_CBC_CMD(msg=0))
-status_str = pulp.LpStatus[status]
+## Linear optimisation (cached: only re-solved when the LP inputs change)
+allocations = solve_allocation(
+    tuple(enabled_groups),
+    tuple(inputs[gf].supply for gf in enabled_groups),
+    tuple(inputs[gf].prop for gf in enabled_groups),
+    tuple(inputs[gf].eco for gf in enabled_groups),
+    int(prop_tolerance)
+)
 
-if status_str != "Optimal":
+if allocations is None:
     st.error("❌ No feasible solution found. Check supply vs. proportions.")
 else:
-    allocations = [int(pulp.value(alloc[gf])) for gf in enabled_groups]
-    available = [supply.get(gf, 0) for gf in enabled_groups]
-    target_perc = [round(user_props[gf], 3) for gf in enabled_groups]
-
-    total_alloc = sum(allocations)
-    achieved_perc = [a / total_alloc for a in allocations] if total_alloc > 0 else [0 for _ in allocations]
+    available = [inputs[gf].supply for gf in enabled_groups]
+    alloc_arr = np.array(allocations, dtype=float)
+    score_arr = np.array([inputs[gf].eco for gf in enabled_groups], dtype=float)
 
     result_df = pd.DataFrame({
-        "Available": available,
-        "Optimal Allocation": allocations,
-        "Target %": target_perc,
-        "Achieved %": achieved_perc,
-        "Eco score": [eco_scores[f] for f in enabled_groups],
-        "Score contribution": [eco_scores[f] * a for f, a in zip(enabled_groups, allocations)]
+        "Available": np.array(available),
+        "Optimal Allocation": np.array(allocations),
+        "Target %": np.array([inputs[gf].prop for gf in enabled_groups], dtype=float),
+        "Achieved %": alloc_arr / alloc_arr.sum(),
+        "Eco score": score_arr,
+        "Score contribution": alloc_arr * score_arr
     }, index=enabled_groups)
 
-    ## Add totals row
-    result_df.loc["Total"] = [
-        sum(result_df["Available"]),
-        sum(result_df["Optimal Allocation"]),
-        "-",
-        1.0 if total_alloc > 0 else 0,
-        "-",
-        sum(result_df["Score contribution"])
-    ]
+    ## Totals row is added for display only; non-summable columns are left empty and shown as "-"
+    totals = result_df.sum()
+    totals[["Target %", "Eco score"]] = np.nan
+    display_df = pd.concat([result_df, totals.to_frame("Total").T.astype(result_df.dtypes)])
 
-    st.write("### Optimal Allocation", result_df.round(3))
-    st.caption(f"Total ecological function score: {sum(result_df['Score contribution'][:-1]):.2f}")
+    st.write("### Optimal Allocation")
+    st.dataframe(display_df.style.format(precision=3, na_rep="-"))
+    st.caption(f"Total ecological function score: {totals['Score contribution']:.2f}")
 
     
     ## Visualisations
@@ -210,36 +376,16 @@ else:
     st.subheader("Visualisations")
     col1, col2 = st.columns(2)
     with col1:
-        fig, ax = plt.subplots(figsize=(7, 4))
-        result_df[["Available", "Optimal Allocation"]].iloc[:-1].plot(kind="bar", ax=ax, rot=0)
-        ax.set_xticklabels(enabled_groups, fontsize=9)
-        ax.set_title("Fragments: Available vs Planned Allocation", fontsize=12)
-        ax.set_ylabel("Number of Fragments", fontsize=10)
-        ax.set_xlabel("Growth form", fontsize=10)
-        ax.tick_params(axis="y", labelsize=9)
-        ax.legend(fontsize=9)
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.pyplot(make_alloc_bar_figure(tuple(available), tuple(allocations), tuple(enabled_groups)))
 
     with col2:
-        fig2, ax2 = plt.subplots(figsize=(7, 5))
-        result_df["Optimal Allocation"].iloc[:-1].plot.pie(
-            labels=result_df.index[:-1],
-            autopct="%1.1f%%",
-            ax=ax2,
-            textprops={"fontsize": 9}  # controls pie label font size
-        )
-        ax2.set_ylabel("")
-        ax2.set_title("Proportion of Allocated Fragments", fontsize=12)
-        ax2.legend(fontsize=9, bbox_to_anchor=(1.05, 1), loc="upper left")
-        st.pyplot(fig2)
+        st.pyplot(make_alloc_pie_figure(tuple(allocations), tuple(enabled_groups)))
     
     ## Reef Layout Grid Visualisation
     
     st.subheader("Simulated Reef Layout with Clustering")
 
     st.markdown("#### Clustering Weights (0–1)")
-    clustering_scores = {}
     default_cluster = {
         "Branching": 0.3,
         "Massive/Sub-massive": 1.0,
@@ -265,10 +411,10 @@ else:
             except ValueError:
                 st.warning(f"{gf}: invalid input. Using default.")
                 score = default_cluster.get(gf, 0.5)
-            clustering_scores[gf] = score
+            inputs[gf].cluster = score
 
     if st.button("🔀 Shuffle Layout"):
-        st.session_state.layout_seed = np.random.randint(0, 1_000_000)
+        st.session_state.layout_seed = np.random.default_rng().integers(0, 1_000_000)
 
     site_area = st.number_input(
         "Restoration Site Area (m²)", min_value=10, value=100, step=10,
@@ -294,13 +440,14 @@ else:
     site_aspect = ratio_map[shape_choice]
 
     fragments_per_star = 14
-    reef_stars = []
-    for gf, alloc_value in zip(enabled_groups, allocations):
-        n_stars = max(1, math.ceil(alloc_value / fragments_per_star))
-        reef_stars.extend([gf] * n_stars)
+    ## Reef stars per growth form: ceiling division of the allocation, at least one each
+    stars_per_gf = np.maximum(1, (np.asarray(allocations, dtype=np.int64) + fragments_per_star - 1) // fragments_per_star)
 
-    np.random.seed(st.session_state.layout_seed)
-    np.random.shuffle(reef_stars)
+    ## Reef stars are encoded as uint8 indices into enabled_groups
+    reef_stars = np.repeat(np.arange(len(enabled_groups), dtype=np.uint8), stars_per_gf)
+
+    rng = np.random.default_rng(st.session_state.layout_seed)
+    rng.shuffle(reef_stars)
 
     total_stars = len(reef_stars)
     reef_height = max(5, int(np.sqrt(total_stars / site_aspect)))
@@ -310,49 +457,14 @@ else:
         cell_area = site_area / (reef_height * reef_width)
         st.caption(f"Approximate area per grid cell: ~{cell_area:.2f} m²")
 
-    grid = np.full((reef_height, reef_width), None, dtype=object)
-
-    unplaced = 0
-    for gf in reef_stars:
-        score = clustering_scores[gf]
-        placed = False
-        for _ in range(200):
-            if np.random.rand() < score:
-                positions = list(zip(*np.where(grid == gf)))
-                if positions:
-                    y, x = positions[np.random.randint(len(positions))]
-                    y_new = min(max(y + np.random.randint(-1, 2), 0), reef_height - 1)
-                    x_new = min(max(x + np.random.randint(-1, 2), 0), reef_width - 1)
-                else:
-                    y_new = np.random.randint(reef_height)
-                    x_new = np.random.randint(reef_width)
-            else:
-                y_new = np.random.randint(reef_height)
-                x_new = np.random.randint(reef_width)
-            if grid[y_new, x_new] is None:
-                grid[y_new, x_new] = gf
-                placed = True
-                break
-        if not placed:
-            unplaced += 1
+    cluster_arr = np.array([inputs[gf].cluster for gf in enabled_groups])
 
-    st.caption("ℹ️ Note: Some reef stars may not fit if the site area is too small or clustering too high. This can be corrected in future model refinements.")
+    grid = place_reef_stars(reef_stars, cluster_arr, reef_height, reef_width, rng)
+    unplaced = total_stars - np.count_nonzero(grid != EMPTY_CELL)
 
-    colors = plt.cm.tab10.colors[:len(enabled_groups)]
-    gf_ids = {gf: i for i, gf in enumerate(enabled_groups)}
-    color_grid = np.zeros((reef_height, reef_width, 3))
-    for gf in enabled_groups:
-        mask = grid == gf
-        color_grid[mask] = colors[gf_ids[gf]][:3]
+    st.caption("ℹ️ Note: Some reef stars may not fit if the site area is too small or clustering too high. This can be corrected in future model refinements.")
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(color_grid, origin="lower")
-    ax.set_xticks([])
-    ax.set_yticks([])
-    legend_handles = [Patch(color=colors[i], label=gf) for i, gf in enumerate(enabled_groups)]
-    ax.legend(handles=legend_handles, bbox_to_anchor=(1.05, 1), loc="upper left")
-    ax.set_title(f"Simulated Reef Layout with Clustering (Dynamic Grid)\nEach square ≈ {fragments_per_star} fragments / 1 reef star")
-    st.pyplot(fig)
+    st.pyplot(make_reef_layout_figure(grid.tobytes(), grid.shape, tuple(enabled_groups), fragments_per_star))
 
     if unplaced > 0:
         st.warning(f"{unplaced} tiles could not be placed due to space/constraints. Increase area or reduce fragments per tile.")
@@ -363,25 +475,21 @@ else:
     
     st.subheader("Ecological Benchmarks")
 
-    benchmarks = []
-    for gf, alloc_value in zip(enabled_groups, allocations):
-        expected_adults = alloc_value * survival_rate
-        fam_density = (expected_adults / site_area) * 100
-        if fam_density < 13:
-            status = "⚠️ Below threshold"
-        elif fam_density > 50:
-            status = "⚠️ Above typical range"
-        else:
-            status = "✅ Within range"
-        benchmarks.append({
-            "Growth form": gf,
-            "Allocated fragments": int(alloc_value),
-            f"Expected adults ({int(survival_rate*100)}%)": int(round(expected_adults)),
-            "Density (/100 m²)": round(fam_density, 0),
-            "Status": status
-        })
-
-    benchmarks_df = pd.DataFrame(benchmarks)
+    expected_adults = alloc_arr * survival_rate
+    fam_density = (expected_adults / site_area) * 100
+    status = np.select(
+        [fam_density < 13, fam_density > 50],
+        ["⚠️ Below threshold", "⚠️ Above typical range"],
+        "✅ Within range"
+    )
+
+    benchmarks_df = pd.DataFrame({
+        "Growth form": enabled_groups,
+        "Allocated fragments": alloc_arr.astype(int),
+        f"Expected adults ({int(survival_rate*100)}%)": expected_adults.round().astype(int),
+        "Density (/100 m²)": fam_density.round(0),
+        "Status": status
+    })
     st.table(benchmarks_df)
 
     st.caption(